@@ -1,35 +1,146 @@
+import asyncio
 import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
 
 import torch
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.staticfiles import StaticFiles
 from loguru import logger
 from pydantic import BaseModel
 from slanggen import models
+from starred_store import StarredStore
 from tokenizers import Tokenizer
 from utils import sample_n
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger.add("logs/app.log", rotation="5 MB")
 
+# no worker processes here, so the Rust tokenizer may parallelize its
+# batch calls (decode table construction) without fork hazards
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "true")
+
+# input shapes are fixed, so let cuDNN autotune the fastest RNN kernels
+torch.backends.cudnn.benchmark = True
+
 FRONTEND_FOLDER = Path("static").resolve()
 ARTEFACTS = Path("artefacts").resolve()
-model_state = {}
+
+# assigned once by lifespan; the readiness gate keeps requests out until then
+model = None
+tokenizer = None
+
+# Dynamic micro-batching: concurrent /generate requests landing within
+# MAX_WAIT_MS of each other are fused into a single sample_n call, so the
+# model runs one forward pass instead of one per request.
+MAX_BATCH = 64
+MAX_WAIT_MS = 10
+batch_queue: asyncio.Queue | None = None
+
+# all blocking sample_n calls go through this single-thread executor: the
+# event loop stays free and model access is serialized in one place
+sample_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sample")
+
+# flipped exactly once when lifespan finishes warmup; requests only ever
+# pay a boolean check instead of re-validating model state
+_ready = asyncio.Event()
+
+# LRU cache of generated words per (num_words, temperature) bucket.
+# Repeated calls with the same parameters are served from the pool without
+# touching the model; a background refill tops the pool up once it drops
+# below the low-water mark. Bounded so it cannot grow without limit.
+CACHE_MAX_BUCKETS = 64
+CACHE_REFILL_SIZE = 256
+CACHE_LOW_WATER = 64
+word_cache: OrderedDict[tuple[int, float], list[str]] = OrderedDict()
+_refilling: set[tuple[int, float]] = set()
+
+# the tokenizer file never changes within a process, so parse it only once
+# per path; load_model now runs once per lifespan, but the cache still saves
+# re-parsing when lifespan is entered repeatedly (e.g. one TestClient per test)
+_tokenizer_cache: dict[str, Tokenizer] = {}
+
+
+def _load_tokenizer(tokenizerfile: str) -> Tokenizer:
+    if tokenizerfile not in _tokenizer_cache:
+        _tokenizer_cache[tokenizerfile] = Tokenizer.from_file(tokenizerfile)
+    return _tokenizer_cache[tokenizerfile]
+
+
+def _load_state_dict(modelpath: str, device: str):
+    # weights_only skips the pickle machinery for arbitrary objects and
+    # mmap maps the file instead of reading it into an extra buffer
+    try:
+        return torch.load(modelpath, weights_only=True, map_location=device, mmap=True)
+    except TypeError:
+        # torch < 2.1 has no mmap argument
+        return torch.load(modelpath, weights_only=True, map_location=device)
+
 
 def load_model():
     logger.info(f"Loading model and tokenizer from {ARTEFACTS}")
+    device = "cuda" if torch.cuda.is_available() else "cpu"
     tokenizerfile = str(ARTEFACTS / "tokenizer.json")
-    tokenizer = Tokenizer.from_file(tokenizerfile)
-    with (ARTEFACTS / "config.json").open("r") as f:
-        config = json.load(f)
-    model = models.SlangRNN(config["model"])
     modelpath = str(ARTEFACTS / "model.pth")
-    model.load_state_dict(torch.load(modelpath, weights_only=False))
-    logger.success("Model and tokenizer loaded successfully")
+    # the tokenizer and the state dict are independent files; load them
+    # in parallel while the main thread reads the config and builds the model
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        tokenizer_future = pool.submit(_load_tokenizer, tokenizerfile)
+        state_future = pool.submit(_load_state_dict, modelpath, device)
+        raw_config = (ARTEFACTS / "config.json").read_bytes()
+        config = orjson.loads(raw_config) if orjson else json.loads(raw_config)
+        model = models.SlangRNN(config["model"])
+        model.load_state_dict(state_future.result())
+        tokenizer = tokenizer_future.result()
+    model.eval()
+    model = model.to(device)
+    if device == "cuda":
+        # fp16 halves activation bandwidth; fine for sampling, no gradients
+        model = model.half()
+    elif config.get("quantize", True):
+        # kill-switch: int8 changes the sampling distribution slightly, so
+        # "quantize": false in config.json restores fp32 if quality regresses
+        model = _quantize_model(model)
+    model = _compile_model(model)
+    logger.success(f"Model and tokenizer loaded successfully on {device}")
     return model, tokenizer
 
+
+def _quantize_model(model):
+    """Dynamic int8 quantization for CPU inference: Linear weights are
+    stored as int8 and their matmuls run in the int8 kernels. Plain nn.RNN
+    has no dynamic-quantized counterpart, so only the linear layers (the
+    projection and the vocab head) are converted."""
+    from torch import nn
+
+    return torch.ao.quantization.quantize_dynamic(
+        model, {nn.Linear}, dtype=torch.qint8
+    )
+
+
+def _compile_model(model):
+    """Compile the model so the per-token step doesn't pay eager-mode
+    dispatch overhead; fall back to TorchScript, then eager."""
+    if hasattr(torch, "compile"):
+        try:
+            return torch.compile(model, mode="reduce-overhead", fullgraph=False)
+        except Exception as e:
+            logger.warning(f"torch.compile failed, trying TorchScript: {e}")
+    try:
+        return torch.jit.script(model)
+    except Exception as e:
+        logger.warning(f"TorchScript failed, staying in eager mode: {e}")
+    return model
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -58,46 +169,196 @@ async def lifespan(app: FastAPI):
     else:
         logger.info(f"Found {ARTEFACTS}")
 
+    global model, tokenizer
     model, tokenizer = load_model()
-    model_state["model"] = model
-    model_state["tokenizer"] = tokenizer
+
+    global batch_queue
+    batch_queue = asyncio.Queue()
+    batch_task = asyncio.create_task(_batch_worker())
+
+    await asyncio.get_running_loop().run_in_executor(sample_executor, _warmup)
+    _ready.set()
     logger.info("Application startup complete")
 
     yield
 
     logger.info("Application shutdown...")
-    model_state.clear()
+    _ready.clear()
+    batch_task.cancel()
+    batch_queue = None
+    starred_store.close()
     logger.success("Application shutdown complete")
 
 
-app = FastAPI()
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that tells browsers to cache assets, so repeat visits
+    don't hit the server at all."""
+
+    async def get_response(self, path, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code == 200:
+            response.headers["Cache-Control"] = "public, max-age=3600"
+        return response
+
+
+# orjson serializes the small JSON payloads (health, starred lists, word
+# lists) several times faster than the stdlib encoder
+if orjson is not None:
+    from fastapi.responses import ORJSONResponse
+
+    app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+else:
+    app = FastAPI(lifespan=lifespan)
 
 # Serve static files
-app.mount("/static", StaticFiles(directory=str(FRONTEND_FOLDER)), name="static")
+app.mount("/static", CachedStaticFiles(directory=str(FRONTEND_FOLDER)), name="static")
 
-model, tokenizer = load_model()
-starred_words = []
+# in-memory dict with SQLite write-behind: stars survive restarts and the
+# endpoints keep O(1) add/remove without waiting on disk. In docker the
+# path points into the compose volume so the db outlives the container.
+starred_store = StarredStore(os.environ.get("STARRED_DB", "starred.db"))
 
 
 def new_words(n: int, temperature: float):
-    output_words = sample_n(
-        n=n,
-        model=model,
-        tokenizer=tokenizer,
-        max_length=20,
-        temperature=temperature,
-    )
+    # inference_mode skips autograd bookkeeping entirely
+    with torch.inference_mode():
+        output_words = sample_n(
+            n=n,
+            model=model,
+            tokenizer=tokenizer,
+            max_length=20,
+            temperature=temperature,
+        )
     return output_words
 
 
+def _warmup():
+    """Run a few throwaway samples at startup so torch.compile graphs and
+    cuDNN autotuning are paid before the first real request. Failures are
+    logged but don't block boot: a slow first request beats no service."""
+    start = time.perf_counter()
+    try:
+        for temperature in (0.7, 1.0):
+            new_words(2, temperature)
+    except Exception as e:
+        logger.warning(f"Model warmup failed, first request will be slow: {e}")
+        return
+    logger.info(f"Model warmup finished in {time.perf_counter() - start:.2f}s")
+
+
+def _temperature_bucket(temperature: float) -> float:
+    # round to 0.05 so near-identical temperatures share one forward pass
+    return round(round(temperature / 0.05) * 0.05, 2)
+
+
+async def _batch_worker():
+    """Drain the queue, fuse pending requests and run sample_n once per
+    temperature bucket in a thread so the event loop stays responsive."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await batch_queue.get()]
+        deadline = loop.time() + MAX_WAIT_MS / 1000
+        while len(batch) < MAX_BATCH:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(batch_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        buckets: dict[float, list] = {}
+        for n, temperature, future in batch:
+            buckets.setdefault(_temperature_bucket(temperature), []).append((n, future))
+
+        for temperature, entries in buckets.items():
+            total = sum(n for n, _ in entries)
+            try:
+                words = await loop.run_in_executor(
+                    sample_executor, partial(new_words, total, temperature)
+                )
+            except Exception as e:
+                for _, future in entries:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            offset = 0
+            for n, future in entries:
+                if not future.done():
+                    future.set_result(words[offset : offset + n])
+                offset += n
+
+
+async def _generate(n: int, temperature: float) -> list[str]:
+    if batch_queue is None:
+        # lifespan hasn't started the worker; fall back to a direct call
+        return new_words(n, temperature)
+    future = asyncio.get_running_loop().create_future()
+    await batch_queue.put((n, temperature, future))
+    return await future
+
+
+async def _refill_pool(key: tuple[int, float], temperature: float):
+    try:
+        # bypass the batcher on purpose: a refill enqueued there would be
+        # fused into the same sample_n call as waiting foreground requests,
+        # making the first request of a bucket pay for the whole refill.
+        # Going straight to the single-thread executor queues it behind any
+        # in-flight foreground work instead.
+        words = await asyncio.get_running_loop().run_in_executor(
+            sample_executor, partial(new_words, CACHE_REFILL_SIZE, temperature)
+        )
+        pool = word_cache.get(key)
+        if pool is not None:
+            # only extend a live bucket; resurrecting an evicted key would
+            # sidestep the CACHE_MAX_BUCKETS bound
+            pool.extend(words)
+    except Exception as e:
+        logger.warning(f"Cache refill for {key} failed: {e}")
+    finally:
+        _refilling.discard(key)
+
+
+def _schedule_refill(key: tuple[int, float], temperature: float):
+    if key not in _refilling:
+        _refilling.add(key)
+        asyncio.create_task(_refill_pool(key, temperature))
+
+
+async def _generate_cached(n: int, temperature: float) -> list[str]:
+    key = (n, round(temperature, 2))
+    pool = word_cache.get(key)
+    if pool is not None:
+        word_cache.move_to_end(key)
+        if len(pool) >= n:
+            words = [pool.pop() for _ in range(n)]
+            if len(pool) < CACHE_LOW_WATER:
+                _schedule_refill(key, temperature)
+            return words
+    else:
+        word_cache[key] = []
+        while len(word_cache) > CACHE_MAX_BUCKETS:
+            word_cache.popitem(last=False)
+    # miss: serve the foreground request first, then top the pool up in the
+    # background so the caller never waits on refill traffic
+    words = await _generate(n, temperature)
+    _schedule_refill(key, temperature)
+    return words
+
+
 class Word(BaseModel):
     word: str
 
 
 @app.get("/generate")
-async def generate_words(num_words: int = 10, temperature: float = 1.0):
+async def generate_words(
+    num_words: int = Query(10, ge=1, le=100),
+    temperature: float = Query(1.0, gt=0.0, le=5.0),
+):
+    if not _ready.is_set():
+        raise HTTPException(status_code=503, detail="Model is still warming up")
     try:
-        words = new_words(num_words, temperature)
+        words = await _generate_cached(num_words, temperature)
         return words
     except Exception as e:
         logger.exception(f"Error generating words: {e}")
@@ -106,32 +367,37 @@ async def generate_words(num_words: int = 10, temperature: float = 1.0):
 
 @app.get("/starred")
 async def get_starred_words():
-    return starred_words
+    return starred_store.list()
 
 
 @app.post("/starred")
 async def add_starred_word(word: Word):
-    if word.word not in starred_words:
-        starred_words.append(word.word)
-    return starred_words
+    return starred_store.add(word.word)
 
 
 @app.post("/unstarred")
 async def remove_starred_word(word: Word):
-    if word.word in starred_words:
-        starred_words.remove(word.word)
-    return starred_words
+    return starred_store.remove(word.word)
+
+
+@app.post("/admin/flush_cache")
+async def flush_cache():
+    buckets = len(word_cache)
+    word_cache.clear()
+    logger.info(f"Flushed {buckets} cache buckets")
+    return {"flushed_buckets": buckets}
 
 
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    return {"status": "ok", "ready": _ready.is_set()}
 
 
-@app.get("/")
-async def read_index():
-    logger.info("serving index.html")
-    return FileResponse("static/index.html")
+# mounted last so the API routes above take precedence; html=True serves
+# index.html at / straight from Starlette without a Python handler
+app.mount(
+    "/", CachedStaticFiles(directory=str(FRONTEND_FOLDER), html=True), name="frontend"
+)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+import sqlite3
+import threading
+
+
+class StarredStore:
+    """Starred words kept in an in-memory dict and persisted to SQLite by a
+    background writer thread (write-behind). The HTTP path only touches the
+    dict — O(1) add/remove/contains and never a disk wait — while the writer
+    coalesces bursts of changes into one transaction per flush interval.
+    """
+
+    def __init__(self, dbpath: str = "starred.db", flush_interval: float = 1.0):
+        self._dbpath = str(dbpath)
+        self._flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._words: dict[str, None] = {}
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._init_db()
+        self._load()
+        self._writer = threading.Thread(
+            target=self._write_behind, name="starred-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _connect(self):
+        return sqlite3.connect(self._dbpath)
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS starred_words "
+                "(word TEXT PRIMARY KEY, position INTEGER)"
+            )
+
+    def _load(self):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT word FROM starred_words ORDER BY position"
+            ).fetchall()
+        with self._lock:
+            self._words = {row[0]: None for row in rows}
+
+    def add(self, word: str) -> list[str]:
+        with self._lock:
+            if word not in self._words:
+                self._words[word] = None
+                self._dirty.set()
+            return list(self._words)
+
+    def remove(self, word: str) -> list[str]:
+        with self._lock:
+            if word in self._words:
+                del self._words[word]
+                self._dirty.set()
+            return list(self._words)
+
+    def list(self) -> list[str]:
+        with self._lock:
+            return list(self._words)
+
+    def _flush(self):
+        with self._lock:
+            snapshot = list(self._words)
+        with self._connect() as conn:
+            conn.execute("DELETE FROM starred_words")
+            conn.executemany(
+                "INSERT INTO starred_words (word, position) VALUES (?, ?)",
+                [(word, position) for position, word in enumerate(snapshot)],
+            )
+
+    def _write_behind(self):
+        while not self._stop.is_set():
+            self._dirty.wait()
+            if self._stop.is_set():
+                break
+            # let a burst of changes accumulate before hitting the disk
+            self._stop.wait(self._flush_interval)
+            self._dirty.clear()
+            self._flush()
+
+    def close(self):
+        """Stop the writer and flush any pending changes synchronously."""
+        self._stop.set()
+        self._dirty.set()
+        self._writer.join(timeout=5)
+        self._flush()
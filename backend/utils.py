@@ -1,52 +1,89 @@
 import random
-import string
 
+import numpy as np
 import torch
 
 
-def _generate_word(start_letter, model, tokenizer, max_length, temperature=1.0):
+def _sample_from_logits(logits, temperature, r):
+    # softmax + inverse-CDF sampling on a plain numpy array; cheaper than
+    # torch.softmax + torch.multinomial for a single small logit vector
+    scaled = logits / temperature
+    scaled = scaled - scaled.max()
+    probs = np.exp(scaled)
+    cdf = np.cumsum(probs)
+    return int(np.searchsorted(cdf, r * cdf[-1]))
+
+# one decoded string per token id, built once per tokenizer so words are
+# assembled with a list lookup + join instead of a tokenizer.decode call.
+# The tokenizer itself is stored next to its table: holding the reference
+# keeps the object alive, so CPython can't recycle its id() for a new
+# tokenizer and serve it a stale table
+_decode_tables: dict[int, tuple[object, list[str]]] = {}
 
-    start_token_idx = tokenizer.encode("<s>").ids[0]
 
-    # try:
-    #     start_letter_idx = tokenizer.encode(start_letter).ids[0]
-    # except IndexError:
-    #     logger.warning(
-    #         f"Start letter '{start_letter}' not in tokenizer vocabulary. Using 'a' instead."
-    #     )
-    #     start_letter_idx = tokenizer.encode("a").ids[0]
+def _decode_table(tokenizer) -> list[str]:
+    entry = _decode_tables.get(id(tokenizer))
+    if entry is not None and entry[0] is tokenizer:
+        return entry[1]
+    ids = [[i] for i in range(tokenizer.get_vocab_size())]
+    table = tokenizer.decode_batch(ids)
+    _decode_tables[id(tokenizer)] = (tokenizer, table)
+    return table
 
-    input_seq = torch.tensor([[start_token_idx]], dtype=torch.long)
+
+def _generate_word(
+    model, param, start_token_idx, pad_token_idx, table, max_length, temperature=1.0
+):
+    # one reusable (1, 1) input buffer: the hidden state already carries the
+    # prefix, so each step only needs the latest token — no per-step tensor
+    # allocations and no re-encoding of the growing sequence
+    input_seq = torch.tensor([[start_token_idx]], dtype=torch.long, device=param.device)
 
     generated_word = []
 
-    model.eval()
-    hidden = model.init_hidden(input_seq)
+    hidden = model.init_hidden(input_seq).to(param.device, param.dtype)
 
     for _ in range(max_length - 1):
         with torch.no_grad():
             output, hidden = model(input_seq, hidden)
 
         logits = output.squeeze(0)[-1, :]
-        scaled_logits = logits / temperature
-        probabilities = torch.softmax(scaled_logits, dim=-1)
-        next_token = torch.multinomial(probabilities, 1).item()
+        if logits.device.type == "cpu":
+            next_token = _sample_from_logits(
+                logits.numpy(), temperature, random.random()
+            )
+        else:
+            scaled_logits = logits / temperature
+            probabilities = torch.softmax(scaled_logits, dim=-1)
+            next_token = torch.multinomial(probabilities, 1).item()
 
-        if next_token == tokenizer.token_to_id("<pad>"):
+        if next_token == pad_token_idx:
             break
         generated_word.append(next_token)
-        input_seq = torch.tensor([generated_word], dtype=torch.long)
-    return tokenizer.decode(generated_word)
+        input_seq[0, 0] = next_token
+    return "".join(table[token] for token in generated_word)
 
 
 def sample_n(n: int, model, tokenizer, max_length=20, temperature=1.0) -> list[str]:
+    # loop-invariant lookups hoisted out of the per-word loop: each of these
+    # crosses into the Rust tokenizer or the torch C++ core, so pay the FFI
+    # cost once per call instead of once per generated word
+    start_token_idx = tokenizer.encode("<s>").ids[0]
+    pad_token_idx = tokenizer.token_to_id("<pad>")
+    table = _decode_table(tokenizer)
+    # follow the model: tensors must live on its device and the hidden
+    # state must match its dtype (fp16 when loaded on cuda)
+    param = next(model.parameters())
+    model.eval()
+
     output_words = []
     for _ in range(n):
-        random_start_letter = random.choice(string.ascii_lowercase)
         new_word = _generate_word(
-            random_start_letter,
             model,
-            tokenizer,
+            param,
+            start_token_idx,
+            pad_token_idx,
+            table,
             max_length=max_length,
             temperature=temperature,
         )
@@ -1,11 +1,11 @@
+from __future__ import annotations
+
 import re
 from pathlib import Path
 
 import requests
-import torch
 from bs4 import BeautifulSoup
 from slanggen.custom_logger import logger
-from torch.nn.utils.rnn import pad_sequence
 
 
 def get_data(filename: Path, url: str) -> list[str]:
@@ -58,7 +58,14 @@ def load_data(filename: Path, url: str) -> list[str]:
 
 
 def preprocess(corpus: list[str], tokenizer) -> torch.Tensor:
-    encoded_sequences = [tokenizer.encode(word).ids for word in corpus]
+    # torch is imported lazily so the scraping/loading helpers above don't
+    # pay its import cost when used on their own
+    import torch
+    from torch.nn.utils.rnn import pad_sequence
+
+    # encode_batch runs the whole corpus through the Rust tokenizer in one
+    # call (parallelized internally) instead of one encode per word
+    encoded_sequences = [enc.ids for enc in tokenizer.encode_batch(corpus)]
     padded_sequences = pad_sequence(
         [torch.tensor(seq) for seq in encoded_sequences], batch_first=True
     )
@@ -11,7 +11,9 @@ from torch import nn, optim
 from torch.optim.lr_scheduler import ReduceLROnPlateau
 from torch.utils.data import DataLoader
 
-os.environ["TOKENIZERS_PARALLELISM"] = "false"
+# the DataLoader runs without worker processes, so the Rust tokenizer can
+# safely parallelize encode_batch/decode_batch internally
+os.environ["TOKENIZERS_PARALLELISM"] = "true"
 
 
 def main():
@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+# the backend is a flat script-style package (app.py imports "utils"), so
+# put it on sys.path the same way uvicorn does when run from backend/;
+# the tests folder itself is added so test modules can share the fakes
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
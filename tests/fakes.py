@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+import torch
+
+VOCAB = ["<pad>", "<s>", "a", "b"]
+
+
+class FakeTokenizer:
+    """Hand-rolled stand-in for tokenizers.Tokenizer: no model files, no
+    Rust extension state, just the four methods the sampler touches."""
+
+    def encode(self, text):
+        return SimpleNamespace(ids=[VOCAB.index("<s>")])
+
+    def token_to_id(self, token):
+        return VOCAB.index(token)
+
+    def get_vocab_size(self):
+        return len(VOCAB)
+
+    def decode_batch(self, ids):
+        return [VOCAB[seq[0]] if seq[0] > 1 else "" for seq in ids]
+
+
+class FakeModel:
+    """Minimal model double: always puts all probability mass on one token."""
+
+    def __init__(self, favourite_token: int):
+        self.favourite_token = favourite_token
+        self._param = torch.zeros(1)
+
+    def parameters(self):
+        return iter([self._param])
+
+    def eval(self):
+        return self
+
+    def init_hidden(self, x):
+        return torch.zeros(1, x.shape[0], 4)
+
+    def __call__(self, x, hidden):
+        logits = torch.full((1, 1, len(VOCAB)), -100.0)
+        logits[0, 0, self.favourite_token] = 100.0
+        return logits, hidden
@@ -0,0 +1,112 @@
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+from fakes import VOCAB, FakeModel, FakeTokenizer
+from fastapi.testclient import TestClient
+from starred_store import StarredStore
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# app.py resolves static/ and artefacts/ relative to the cwd, exactly as
+# uvicorn runs it from backend/, so import it from there
+_cwd = os.getcwd()
+os.chdir(REPO_ROOT / "backend")
+import app as backend_app  # noqa: E402
+
+os.chdir(_cwd)
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    # pin the artefacts path: lifespan's fallback lookup resolves
+    # "../artefacts" against the cwd, so without this the suite only
+    # passes when pytest happens to be launched from backend/ or tests/
+    monkeypatch.setattr(backend_app, "ARTEFACTS", REPO_ROOT / "artefacts")
+    monkeypatch.setattr(
+        backend_app,
+        "load_model",
+        lambda: (FakeModel(favourite_token=VOCAB.index("a")), FakeTokenizer()),
+    )
+    store = StarredStore(tmp_path / "starred.db", flush_interval=0.01)
+    monkeypatch.setattr(backend_app, "starred_store", store)
+    backend_app.word_cache.clear()
+    backend_app._refilling.clear()
+    with TestClient(backend_app.app) as client:
+        yield client
+    store.close()
+
+
+def test_generate_returns_503_before_lifespan_ready():
+    # no context manager, so lifespan never runs and the gate stays closed
+    client = TestClient(backend_app.app)
+    response = client.get("/generate")
+    assert response.status_code == 503
+
+
+def test_generate_returns_requested_number_of_words(client):
+    response = client.get("/generate", params={"num_words": 3})
+    assert response.status_code == 200
+    words = response.json()
+    assert len(words) == 3
+    assert all(word == "a" * 19 for word in words)
+
+
+def test_generate_rejects_out_of_range_params(client):
+    assert client.get("/generate", params={"num_words": 0}).status_code == 422
+    assert client.get("/generate", params={"num_words": 101}).status_code == 422
+    assert client.get("/generate", params={"temperature": 0}).status_code == 422
+
+
+def test_generate_serves_from_cache_pool(client):
+    backend_app.word_cache[(2, 1.0)] = ["cached"] * 300
+    response = client.get("/generate", params={"num_words": 2})
+    assert response.json() == ["cached", "cached"]
+
+
+def test_flush_cache_empties_all_buckets(client):
+    backend_app.word_cache[(2, 1.0)] = ["cached"] * 300
+    response = client.post("/admin/flush_cache")
+    assert response.json() == {"flushed_buckets": 1}
+    assert len(backend_app.word_cache) == 0
+
+
+def test_health_reports_readiness(client):
+    assert client.get("/health").json() == {"status": "ok", "ready": True}
+
+
+def test_starred_roundtrip(client):
+    assert client.get("/starred").json() == []
+    assert client.post("/starred", json={"word": "kepler"}).json() == ["kepler"]
+    assert client.post("/starred", json={"word": "hoth"}).json() == ["kepler", "hoth"]
+    assert client.post("/unstarred", json={"word": "kepler"}).json() == ["hoth"]
+
+
+def test_batch_worker_fuses_requests_and_slices_results(monkeypatch):
+    calls = []
+
+    def fake_new_words(n, temperature):
+        calls.append((n, temperature))
+        return [f"word{i}" for i in range(n)]
+
+    async def scenario():
+        monkeypatch.setattr(backend_app, "new_words", fake_new_words)
+        backend_app.batch_queue = asyncio.Queue()
+        worker = asyncio.create_task(backend_app._batch_worker())
+        try:
+            return await asyncio.gather(
+                backend_app._generate(2, 1.0),
+                backend_app._generate(3, 1.0),
+                backend_app._generate(1, 0.5),
+            )
+        finally:
+            worker.cancel()
+            backend_app.batch_queue = None
+
+    first, second, third = asyncio.run(scenario())
+    # the two 1.0 requests are fused into one call and sliced back out
+    assert first == ["word0", "word1"]
+    assert second == ["word2", "word3", "word4"]
+    assert third == ["word0"]
+    assert sorted(calls) == [(1, 0.5), (5, 1.0)]
@@ -0,0 +1,21 @@
+from fakes import VOCAB, FakeModel, FakeTokenizer
+from utils import sample_n
+
+
+def test_sample_n_emits_tokens_up_to_max_length():
+    model = FakeModel(favourite_token=VOCAB.index("a"))
+    words = sample_n(n=1, model=model, tokenizer=FakeTokenizer(), max_length=4)
+    assert words == ["aaa"]
+
+
+def test_sample_n_stops_at_pad_token():
+    model = FakeModel(favourite_token=VOCAB.index("<pad>"))
+    words = sample_n(n=1, model=model, tokenizer=FakeTokenizer(), max_length=4)
+    assert words == [""]
+
+
+def test_sample_n_returns_n_words():
+    model = FakeModel(favourite_token=VOCAB.index("b"))
+    words = sample_n(n=5, model=model, tokenizer=FakeTokenizer(), max_length=3)
+    assert len(words) == 5
+    assert all(word == "bb" for word in words)
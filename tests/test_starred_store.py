@@ -0,0 +1,23 @@
+from starred_store import StarredStore
+
+
+def test_add_remove_and_order(tmp_path):
+    store = StarredStore(tmp_path / "starred.db", flush_interval=0.01)
+    store.add("kepler")
+    store.add("tatooine")
+    store.add("kepler")  # duplicate is a no-op
+    assert store.list() == ["kepler", "tatooine"]
+    assert store.remove("kepler") == ["tatooine"]
+    store.close()
+
+
+def test_words_survive_restart(tmp_path):
+    dbpath = tmp_path / "starred.db"
+    store = StarredStore(dbpath, flush_interval=0.01)
+    store.add("kepler")
+    store.add("tatooine")
+    store.close()
+
+    reopened = StarredStore(dbpath, flush_interval=0.01)
+    assert reopened.list() == ["kepler", "tatooine"]
+    reopened.close()